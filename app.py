@@ -9,9 +9,17 @@ import argparse
 import asyncio
 import os
 from pathlib import Path
+from types import ModuleType
+from typing import Optional
 
 from src.scoreboard import ScoreboardSystem
 
+uvloop: Optional[ModuleType]
+try:
+    import uvloop
+except ImportError:  # Not available on Windows; fall back to the stdlib loop
+    uvloop = None
+
 
 async def main():
     """Main function with command line interface."""
@@ -75,4 +83,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -3,8 +3,10 @@ Configuration management for CTF scoreboard.
 Supports both JSON file configuration and environment variable overrides.
 """
 
+import copy
 import json
 import os
+import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -12,6 +14,11 @@ from typing import Dict, Any, Optional
 class CTFConfig:
     """Configuration management for CTF scoreboard."""
 
+    __slots__ = ("config_path", "config")
+
+    SCORING_TYPES = tuple(sys.intern(name) for name in ("golf", "standard"))
+    THEMES = tuple(sys.intern(name) for name in ("competitive", "classic", "minimal"))
+
     DEFAULT_CONFIG = {
         "ctf_name": "CTF Scoreboard",
         "scoring": {
@@ -54,24 +61,25 @@ class CTFConfig:
 
         @return: Dictionary containing the loaded configuration
         """
-        if self.config_path.exists():
-            try:
-                with open(self.config_path, "r", encoding="utf-8") as f:
-                    loaded_config = json.load(f)
-
-                # Merge with defaults to ensure all keys exist
-                config = self.DEFAULT_CONFIG.copy()
-                self._deep_merge(config, loaded_config)
-                return config
-
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading config from {self.config_path}: {e}")
-                print("Using default configuration")
-                return self.DEFAULT_CONFIG.copy()
-        else:
+        # Deep copy so merges and env overrides never touch the class defaults
+        config = copy.deepcopy(self.DEFAULT_CONFIG)
+
+        if not self.config_path.exists():
             # Create default config file
             self._create_default_config()
-            return self.DEFAULT_CONFIG.copy()
+            return config
+
+        try:
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                loaded_config = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading config from {self.config_path}: {e}")
+            print("Using default configuration")
+            return config
+
+        # Merge with defaults to ensure all keys exist
+        self._deep_merge(config, loaded_config)
+        return config
 
     def _deep_merge(
         self,
@@ -189,12 +197,12 @@ class CTFConfig:
         Checks configuration values for validity and sets defaults for invalid values.
         """
         # Validate scoring_type
-        if self.config["scoring"]["scoring_type"] not in ["golf", "standard"]:
+        if self.config["scoring"]["scoring_type"] not in self.SCORING_TYPES:
             print("Warning: Invalid scoring_type, using 'golf'")
             self.config["scoring"]["scoring_type"] = "golf"
 
         # Validate theme
-        if self.config["ui"]["theme"] not in ["competitive", "classic", "minimal"]:
+        if self.config["ui"]["theme"] not in self.THEMES:
             print("Warning: Invalid theme, using 'competitive'")
             self.config["ui"]["theme"] = "competitive"
 
@@ -208,6 +216,12 @@ class CTFConfig:
             print("Warning: Invalid max_leaderboard_entries, using 100")
             self.config["ui"]["max_leaderboard_entries"] = 100
 
+        # Intern enumerated values so per-request comparisons hit the identity fast path
+        self.config["scoring"]["scoring_type"] = sys.intern(
+            self.config["scoring"]["scoring_type"]
+        )
+        self.config["ui"]["theme"] = sys.intern(self.config["ui"]["theme"])
+
     def get(
         self,
         *keys: str,
@@ -2,14 +2,153 @@
 Database operations for CTF scoreboard.
 """
 
+import asyncio
+import json
+import logging
 import time
-from typing import List, Tuple, Dict, Any, Optional
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Set, Tuple, Dict, Any, Optional
 import aiosqlite
 
+# Handlers are attached by ScoreboardSystem; see setup_logging()
+logger = logging.getLogger("scoreboard.db")
+
+
+class AioSqlitePool:
+    """
+    Fixed pool of aiosqlite connections: one read-write, several read-only.
+
+    WAL mode lets the read-only connections run alongside the writer, so
+    page views do not queue behind score submissions.
+    """
+
+    # Applied to every connection; WAL itself is persisted in the database file
+    CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",  # Better performance
+        "PRAGMA cache_size=-10000",  # ~10MB page cache per connection (negative = KiB)
+        "PRAGMA temp_store=MEMORY",  # Use memory for temp storage
+    )
+
+    def __init__(
+        self,
+        db_path: str,
+        n_readers: int = 4,
+    ) -> None:
+        self.db_path = db_path
+        self.n_readers = n_readers
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+        self._write_lock = asyncio.Lock()
+
+    async def _configure(
+        self,
+        conn: aiosqlite.Connection,
+    ) -> aiosqlite.Connection:
+        """
+        Apply per-connection PRAGMAs.
+
+        @param conn: Freshly opened connection
+        @return: The same connection, ready for use
+        """
+        for pragma in self.CONNECTION_PRAGMAS:
+            await conn.execute(pragma)
+        return conn
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Whether open() has been called and close() has not.
+
+        @return: True if the connections are open
+        """
+        return self._writer is not None
+
+    async def open(self) -> None:
+        """
+        Open the writer connection, switch the database to WAL and open the readers.
+
+        The writer is opened first so the database file exists before the
+        read-only connections attach to it.
+        """
+        self._writer = await aiosqlite.connect(self.db_path)
+        # Enable WAL mode for better concurrent access
+        await self._writer.execute("PRAGMA journal_mode=WAL")
+        await self._configure(self._writer)
+
+        reader_uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        for _ in range(self.n_readers):
+            conn = await self._configure(
+                await aiosqlite.connect(reader_uri, uri=True)
+            )
+            # Rows still index and unpack like tuples, but can also be read by column name
+            conn.row_factory = aiosqlite.Row
+            self._readers.append(conn)
+            self._idle_readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Check out a read-only connection, waiting if all are busy.
+
+        @return: Async context manager yielding a read-only connection
+        @raise RuntimeError: If the pool has not been opened
+        """
+        if not self._readers:
+            raise RuntimeError("Connection pool is not open; call init_db() first")
+        conn = await self._idle_readers.get()
+        try:
+            yield conn
+        finally:
+            self._idle_readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Acquire exclusive use of the read-write connection.
+
+        A failed write is rolled back so its partial changes never ride
+        along with the next commit on the shared connection.
+
+        @return: Async context manager yielding the read-write connection
+        @raise RuntimeError: If the pool has not been opened
+        """
+        conn = self._writer
+        if conn is None:
+            raise RuntimeError("Connection pool is not open; call init_db() first")
+        async with self._write_lock:
+            try:
+                yield conn
+            except BaseException:
+                await conn.rollback()
+                raise
+
+    async def close(self) -> None:
+        """
+        Close every connection in the pool.
+        """
+        for conn in self._readers:
+            await conn.close()
+        self._readers.clear()
+        self._idle_readers = asyncio.Queue()
+
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+
 
 class DatabaseManager:
     """Manages database operations with connection pooling and caching."""
 
+    # Number of read-only connections kept open alongside the writer
+    READ_CONNECTIONS = 4
+    # Stored in PRAGMA user_version once all migrations have been applied
+    SCHEMA_VERSION = 1
+    # Least recently used entries are evicted beyond this many
+    CACHE_MAX_ENTRIES = 1024
+
     def __init__(
         self,
         db_path: str,
@@ -17,9 +156,29 @@ class DatabaseManager:
     ) -> None:
         self.db_path = db_path
         self.config = config
-        # Simple in-memory cache with TTL
-        self._cache: Dict[str, Tuple[Any, float]] = {}
-        self._cache_ttl = 30  # 30 seconds TTL
+        # Config is static per process; snapshot the values the queries need
+        self._scoring_type: str = config.get("scoring", "scoring_type")
+        self._sort_order: str = config.get_sort_order()
+        self._max_entries: Optional[int] = config.get("ui", "max_leaderboard_entries")
+        # Connection pool (one writer, several readers), opened in init_db
+        self.pool = AioSqlitePool(db_path, self.READ_CONNECTIONS)
+        # In-memory LRU cache of (data, monotonic expiry, tags) entries, oldest first
+        self._cache: "OrderedDict[str, Tuple[Any, float, Tuple[str, ...]]]" = OrderedDict()
+        # Invalidation tag -> cache keys depending on it
+        self._cache_index: Dict[str, Set[str]] = defaultdict(set)
+        self._cache_ttl = 30  # Default 30 seconds TTL
+        # Bumped on every write so in-flight reads don't cache stale results
+        self._cache_generation = 0
+        # Per-kind TTLs; writes invalidate by tag, so these only bound staleness
+        self._ttl_policy: Dict[str, float] = {
+            "all_challenges": 300,
+            "challenge_data": 15,
+            "player_rankings": 30,
+            "top_players": 30,
+        }
+        # SQL text is fixed per scoring type, so build it once and let
+        # sqlite3's statement cache reuse the compiled statements
+        self._stmts: Dict[str, str] = self._build_statements()
 
     def _get_cache_key(self, *args: Any) -> str:
         """
@@ -41,43 +200,116 @@ class DatabaseManager:
         @return: Cached data if valid, None if expired or not found
         """
         if cache_key in self._cache:
-            data, timestamp = self._cache[cache_key]
+            data, expires_at, _ = self._cache[cache_key]
 
-            if time.time() - timestamp < self._cache_ttl:
+            if time.monotonic() < expires_at:
+                self._cache.move_to_end(cache_key)
                 return data
             else:
                 # Expired, remove from cache
-                del self._cache[cache_key]
+                self._drop_cache_entry(cache_key)
         return None
 
     def _set_cache(
         self,
         cache_key: str,
         data: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        generation: Optional[int] = None,
     ) -> None:
         """
-        Set value in cache with current timestamp.
+        Set value in cache with its expiry time.
 
         @param cache_key: String cache key to store data under
         @param data: Data to cache
+        @param ttl: Seconds the entry stays valid (default uses the cache-wide TTL)
+        @param tags: Invalidation tags the entry depends on (e.g. a challenge)
+        @param generation: Cache generation read before querying; data is not
+            stored if a write happened since, as it may predate that write
         """
-        self._cache[cache_key] = (data, time.time())
+        if generation is not None and generation != self._cache_generation:
+            return
+
+        # Replace rather than overwrite so the old entry's tags are released
+        self._drop_cache_entry(cache_key)
+        while len(self._cache) >= self.CACHE_MAX_ENTRIES:
+            self._drop_cache_entry(next(iter(self._cache)))
+
+        tags = tuple(tags)
+        expires_at = time.monotonic() + (ttl if ttl is not None else self._cache_ttl)
+        self._cache[cache_key] = (data, expires_at, tags)
+
+        for tag in tags:
+            self._cache_index[tag].add(cache_key)
+
+    def _drop_cache_entry(
+        self,
+        cache_key: str,
+    ) -> None:
+        """
+        Remove a single cache entry and unregister it from its tags.
+
+        @param cache_key: String cache key to remove
+        """
+        entry = self._cache.pop(cache_key, None)
+        if entry is None:
+            return
+
+        for tag in entry[2]:
+            tagged_keys = self._cache_index.get(tag)
+            if tagged_keys is not None:
+                tagged_keys.discard(cache_key)
+                if not tagged_keys:
+                    del self._cache_index[tag]
 
     def _invalidate_cache(
         self,
-        pattern: Optional[str] = None,
+        tag: Optional[str] = None,
     ) -> None:
         """
-        Invalidate cache entries matching pattern or all if None.
+        Invalidate cache entries registered under a tag, or all if None.
 
-        @param pattern: Optional string pattern to match cache keys against
+        @param tag: Optional invalidation tag whose entries should be removed
         """
-        if pattern is None:
+        if tag is None:
             self._cache.clear()
+            self._cache_index.clear()
         else:
-            keys_to_remove = [k for k in self._cache if pattern in k]
-            for key in keys_to_remove:
-                del self._cache[key]
+            for cache_key in self._cache_index.pop(tag, ()):
+                self._drop_cache_entry(cache_key)
+
+    def get_data_version(self) -> int:
+        """
+        Get a counter that changes whenever a score write lands.
+
+        Lets callers caching derived data (e.g. rendered pages) detect writes.
+
+        @return: Current cache generation
+        """
+        return self._cache_generation
+
+    def _invalidate_for_score(
+        self,
+        challenge: str,
+    ) -> None:
+        """
+        Invalidate cache entries affected by a new or improved score.
+
+        @param challenge: Challenge the score was saved for
+        """
+        self._cache_generation += 1
+
+        # Per-challenge data and anything tagged with this challenge
+        self._invalidate_cache(self._get_cache_key("challenge", challenge))
+        # Rankings aggregate over every player's scores
+        self._drop_cache_entry(self._get_cache_key("player_rankings"))
+
+        # A challenge not in the cached list changes every whole-table listing
+        challenges = self._get_from_cache(self._get_cache_key("all_challenges"))
+        if challenges is None or challenge not in challenges:
+            self._drop_cache_entry(self._get_cache_key("all_challenges"))
+            self._drop_cache_entry(self._get_cache_key("top_players"))
 
     async def init_db(self) -> None:
         """
@@ -85,13 +317,10 @@ class DatabaseManager:
 
         Creates tables, indexes, and performs schema migrations if needed.
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            # Enable WAL mode for better concurrent access
-            await db.execute("PRAGMA journal_mode=WAL")
-            await db.execute("PRAGMA synchronous=NORMAL")  # Better performance
-            await db.execute("PRAGMA cache_size=10000")  # 10MB cache
-            await db.execute("PRAGMA temp_store=MEMORY")  # Use memory for temp storage
+        if not self.pool.is_open:
+            await self.pool.open()
 
+        async with self.pool.writer() as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS scores (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -127,6 +356,27 @@ class DatabaseManager:
             # Handle schema migration for solve_code column
             await self._migrate_schema(db)
 
+            # Covering index in the configured rank order (created after the
+            # migration since it includes solve_code) so the top-5 window
+            # query reads rows pre-sorted straight from the index; id keeps
+            # same-second ties in submission order
+            await db.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_challenge_rank_{self._sort_order.lower()}
+                ON scores(challenge, score {self._sort_order}, timestamp ASC, id, player_name, solve_code)
+            """)
+
+            # Refresh planner statistics so the new indexes get picked up
+            await db.execute("ANALYZE")
+            await db.commit()
+
+    async def close(self) -> None:
+        """
+        Close all pooled database connections.
+
+        Safe to call more than once; subsequent calls are no-ops.
+        """
+        await self.pool.close()
+
     async def _migrate_schema(
         self,
         db: Any,
@@ -136,20 +386,120 @@ class DatabaseManager:
 
         @param db: Active database connection
         """
+        # Already migrated databases skip the table inspection entirely
+        ((user_version,),) = await db.execute_fetchall("PRAGMA user_version")
+        if user_version >= self.SCHEMA_VERSION:
+            return
+
         # Check if solve_code column exists
-        cursor = await db.execute("PRAGMA table_info(scores)")
-        columns = await cursor.fetchall()
+        columns = await db.execute_fetchall("PRAGMA table_info(scores)")
         column_names = [column[1] for column in columns]
 
         if "solve_code" not in column_names:
-            print("Migrating database schema to add solve_code column...")
+            logger.info("Migrating database schema to add solve_code column...")
 
             await db.execute(
                 "ALTER TABLE scores ADD COLUMN solve_code TEXT DEFAULT 'No solution provided'"
             )
-            await db.commit()
 
-            print("Schema migration completed.")
+            logger.info("Schema migration completed.")
+
+        await db.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+        await db.commit()
+
+    def _build_statements(self) -> Dict[str, str]:
+        """
+        Build the SQL statements whose text depends on the scoring type.
+
+        Keeping the text constant for the lifetime of the manager lets each
+        connection's statement cache hand back the already-compiled query.
+
+        @return: Dictionary mapping statement name to SQL string
+        """
+        sort_order = self._sort_order
+
+        if self._scoring_type == "golf":
+            comparison = "<"  # Lower is better for golf
+            aggregator = "MIN(score)"
+        else:  # standard
+            comparison = ">"  # Higher is better for standard
+            aggregator = "MAX(score)"
+
+        return {
+            # Relies on the idx_player_challenge unique index; the update
+            # only applies when the new score beats the stored one.
+            # Takes (player_name, challenge, score, solve_code, client_ip)
+            "upsert_score": f"""
+                INSERT INTO scores (player_name, challenge, score, solve_code, client_ip)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(player_name, challenge) DO UPDATE SET
+                    score = excluded.score,
+                    solve_code = excluded.solve_code,
+                    timestamp = CURRENT_TIMESTAMP,
+                    client_ip = excluded.client_ip
+                WHERE excluded.score {comparison} scores.score
+            """,
+            "leaderboard": f"""
+                SELECT player_name, score, timestamp, solve_code 
+                FROM scores 
+                WHERE challenge = ? 
+                ORDER BY score {sort_order}, timestamp ASC, id ASC
+                LIMIT ?
+            """,
+            "top_players": f"""
+                SELECT challenge, player_name, {aggregator} as top_score
+                FROM scores 
+                GROUP BY challenge
+                ORDER BY challenge
+            """,
+            # Challenge names are passed as one JSON array so the statement
+            # text does not change with the number of challenges requested.
+            # Each challenge only reads its first six rows off the rank
+            # index; the sixth is kept so a tie at rank 5 is still detected.
+            "challenge_data": f"""
+                WITH Candidates AS (
+                    SELECT 
+                        s.id,
+                        s.challenge,
+                        s.player_name,
+                        s.score,
+                        s.timestamp,
+                        s.solve_code
+                    FROM json_each(?) AS c
+                    JOIN scores AS s ON s.id IN (
+                        SELECT id FROM scores
+                        WHERE challenge = c.value
+                        ORDER BY score {sort_order}, timestamp ASC, id ASC
+                        LIMIT 6
+                    )
+                ),
+                RankedScores AS (
+                    SELECT 
+                        challenge,
+                        player_name,
+                        score,
+                        timestamp,
+                        solve_code,
+                        ROW_NUMBER() OVER (PARTITION BY challenge ORDER BY score {sort_order}, timestamp ASC, id ASC) as rank,
+                        COUNT(*) OVER (PARTITION BY challenge, score) as same_score_count
+                    FROM Candidates
+                )
+                SELECT 
+                    tp.challenge,
+                    tp.player_name,
+                    tp.score,
+                    tp.timestamp,
+                    tp.solve_code,
+                    tp.rank,
+                    tp.same_score_count > 1 as is_tied,
+                    cl.player_name as leader_name,
+                    cl.score as leader_score
+                FROM RankedScores tp
+                LEFT JOIN RankedScores cl ON cl.challenge = tp.challenge AND cl.rank = 1
+                WHERE tp.rank <= 5
+                ORDER BY tp.challenge, tp.rank
+            """,
+        }
 
     async def save_score(
         self,
@@ -169,63 +519,55 @@ class DatabaseManager:
         @param client_ip: IP address of the client (optional)
         @return: True if score was saved/updated, False if not better than existing
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            # Check for existing score
+        async with self.pool.writer() as db:
             cursor = await db.execute(
-                "SELECT score FROM scores WHERE player_name = ? AND challenge = ?",
-                (player_name, challenge),
+                self._stmts["upsert_score"],
+                (player_name, challenge, score, solve_code, client_ip),
             )
-            existing = await cursor.fetchone()
-
-            if existing:
-                old_score = existing[0]
-                scoring_type = self.config.get("scoring", "scoring_type")
-
-                # Determine if new score is better based on scoring type
-                is_better_score = False
-
-                if scoring_type == "golf":
-                    is_better_score = score < old_score  # Lower is better for golf
-                else:  # standard
-                    is_better_score = score > old_score  # Higher is better for standard
-
-                if is_better_score:
-                    await db.execute(
-                        "UPDATE scores SET score = ?, solve_code = ?, timestamp = CURRENT_TIMESTAMP, "
-                        "client_ip = ? WHERE player_name = ? AND challenge = ?",
-                        (score, solve_code, client_ip, player_name, challenge),
-                    )
+            saved = cursor.rowcount > 0
+            await db.commit()
 
-                    print(
-                        f"Updated score for {player_name} in {challenge}: "
-                        f"{old_score} -> {score}"
-                    )
+        if not saved:
+            logger.info(
+                "Score %s for %s in %s not better than existing score",
+                score,
+                player_name,
+                challenge,
+            )
+            return False
 
-                    await db.commit()
+        logger.info("Saved score for %s in %s: %s", player_name, challenge, score)
 
-                    # Invalidate cache when score is updated
-                    self._invalidate_cache()
-                    return True
+        self._invalidate_for_score(challenge)
+        return True
 
-                print(
-                    f"Score {score} for {player_name} in {challenge} "
-                    f"not better than existing {old_score}"
-                )
-                return False
+    async def save_scores_many(
+        self,
+        records: Iterable[Tuple[str, str, int, str, str]],
+    ) -> int:
+        """
+        Save a batch of scores in a single transaction.
 
-            await db.execute(
-                "INSERT INTO scores (player_name, challenge, score, solve_code, client_ip) "
-                "VALUES (?, ?, ?, ?, ?)",
-                (player_name, challenge, score, solve_code, client_ip),
-            )
+        Each record is applied with the same keep-the-best-score rule as
+        save_score, but the whole batch costs one commit.
 
-            print(f"Added new entry: {player_name} in {challenge} with score {score}")
+        @param records: Tuples of (player_name, challenge, score, solve_code, client_ip)
+        @return: Number of scores that were inserted or improved
+        """
+        records = list(records)
+        if not records:
+            return 0
 
+        async with self.pool.writer() as db:
+            cursor = await db.executemany(self._stmts["upsert_score"], records)
+            saved = cursor.rowcount
             await db.commit()
 
-            # Invalidate cache when new score is added
-            self._invalidate_cache()
-            return True
+        logger.info("Saved %d of %d submitted scores", saved, len(records))
+
+        for challenge in {record[1] for record in records}:
+            self._invalidate_for_score(challenge)
+        return saved
 
     async def get_challenge_leaderboard(
         self,
@@ -239,36 +581,59 @@ class DatabaseManager:
         @param limit: Maximum number of entries to return (default 10)
         @return: List of tuples containing player data ordered by score
         """
-        # Use configured sort order
-        sort_order = self.config.get_sort_order()
-        max_entries = self.config.get("ui", "max_leaderboard_entries")
-        actual_limit = min(limit, max_entries) if max_entries else limit
+        actual_limit = min(limit, self._max_entries) if self._max_entries else limit
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.reader() as db:
             cursor = await db.execute(
-                f"""
-                SELECT player_name, score, timestamp, solve_code 
-                FROM scores 
-                WHERE challenge = ? 
-                ORDER BY score {sort_order}, timestamp ASC
-                LIMIT ?
-            """,
+                self._stmts["leaderboard"],
                 (challenge, actual_limit),
             )
             rows = await cursor.fetchall()
             return list(rows)
 
+    async def get_challenge_entry_count(
+        self,
+        challenge: str,
+    ) -> int:
+        """
+        Count the entries on a challenge's leaderboard.
+
+        @param challenge: Challenge name to count entries for
+        @return: Number of players with a score on the challenge
+        """
+        async with self.pool.reader() as db:
+            ((count,),) = await db.execute_fetchall(
+                "SELECT COUNT(*) FROM scores WHERE challenge = ?",
+                (challenge,),
+            )
+        return count
+
     async def get_all_challenges(self) -> List[str]:
         """
         Get all available challenges.
 
         @return: List of unique challenge names
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        cache_key = self._get_cache_key("all_challenges")
+        cached_data = self._get_from_cache(cache_key)
+
+        if cached_data is not None:
+            return cached_data
+
+        generation = self._cache_generation
+        async with self.pool.reader() as db:
             cursor = await db.execute(
                 "SELECT DISTINCT challenge FROM scores ORDER BY challenge"
             )
-            return [row[0] for row in await cursor.fetchall()]
+            challenges = [row[0] for row in await cursor.fetchall()]
+
+        self._set_cache(
+            cache_key,
+            challenges,
+            ttl=self._ttl_policy["all_challenges"],
+            generation=generation,
+        )
+        return challenges
 
     async def get_top_player_per_challenge(self) -> List[Any]:
         """
@@ -276,145 +641,125 @@ class DatabaseManager:
 
         @return: List of tuples containing challenge, player name, and top score
         """
-        scoring_type = self.config.get("scoring", "scoring_type")
+        cache_key = self._get_cache_key("top_players")
+        cached_data = self._get_from_cache(cache_key)
 
-        if scoring_type == "golf":
-            aggregator = "MIN(score)"
-        else:  # standard
-            aggregator = "MAX(score)"
+        if cached_data is not None:
+            return cached_data
 
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(f"""
-                SELECT challenge, player_name, {aggregator} as top_score
-                FROM scores 
-                GROUP BY challenge
-                ORDER BY challenge
-            """)
-            rows = await cursor.fetchall()
+        generation = self._cache_generation
+        async with self.pool.reader() as db:
+            cursor = await db.execute(self._stmts["top_players"])
+            rows = list(await cursor.fetchall())
 
-            return list(rows)
+        self._set_cache(
+            cache_key,
+            rows,
+            ttl=self._ttl_policy["top_players"],
+            tags=[self._get_cache_key("challenge", row[0]) for row in rows],
+            generation=generation,
+        )
+        return rows
 
     async def get_all_challenge_data_optimized(self) -> List[Dict[str, Any]]:
         """
-        Get all challenge data in a single optimized query for web index.
+        Get all challenge data for the web index.
 
-        Uses caching and a single SQL query to efficiently retrieve all
-        challenge data with top 5 players for each challenge.
+        Each challenge is cached separately so a new score only evicts the
+        challenge it belongs to; challenges missing from the cache are
+        fetched together in a single SQL query.
+
+        Each "top5" is a dictionary of parallel lists (rank, player, score,
+        timestamp, solve_code, is_tied) rather than a list of per-row dicts.
 
         @return: List of dictionaries containing challenge data with leaderboards
         """
-        # Check cache first
-        cache_key = self._get_cache_key("all_challenge_data")
-        cached_data = self._get_from_cache(cache_key)
-
-        if cached_data is not None:
-            return cached_data
+        challenges = await self.get_all_challenges()
 
-        # Use configured sort order
-        sort_order = self.config.get_sort_order()
+        challenges_data: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
 
-        async with aiosqlite.connect(self.db_path) as db:
-            # Get all challenges with their top 5 players in one query
-            cursor = await db.execute(f"""
-                WITH RankedScores AS (
-                    SELECT 
-                        challenge,
-                        player_name,
-                        score,
-                        timestamp,
-                        solve_code,
-                        ROW_NUMBER() OVER (PARTITION BY challenge ORDER BY score {sort_order}, timestamp ASC) as rank
-                    FROM scores
-                ),
-                TopPlayers AS (
-                    SELECT 
-                        challenge,
-                        player_name,
-                        score,
-                        timestamp,
-                        solve_code,
-                        rank
-                    FROM RankedScores
-                    WHERE rank <= 5
-                ),
-                ChallengeLeaders AS (
-                    SELECT 
-                        challenge,
-                        player_name as leader_name,
-                        score as leader_score
-                    FROM RankedScores
-                    WHERE rank = 1
+        for challenge in challenges:
+            cached_data = self._get_from_cache(
+                self._get_cache_key("challenge_data", challenge)
+            )
+            if cached_data is None:
+                missing.append(challenge)
+            else:
+                challenges_data[challenge] = cached_data
+
+        if missing:
+            generation = self._cache_generation
+            fetched = await self._fetch_challenge_data(missing)
+            for challenge, challenge_data in fetched.items():
+                self._set_cache(
+                    self._get_cache_key("challenge_data", challenge),
+                    challenge_data,
+                    ttl=self._ttl_policy["challenge_data"],
+                    tags=(self._get_cache_key("challenge", challenge),),
+                    generation=generation,
                 )
-                SELECT 
-                    tp.challenge,
-                    tp.player_name,
-                    tp.score,
-                    tp.timestamp,
-                    tp.solve_code,
-                    tp.rank,
-                    cl.leader_name,
-                    cl.leader_score
-                FROM TopPlayers tp
-                LEFT JOIN ChallengeLeaders cl ON tp.challenge = cl.challenge
-                ORDER BY tp.challenge, tp.rank
-            """)
+            challenges_data.update(fetched)
+
+        return [
+            challenges_data[challenge]
+            for challenge in challenges
+            if challenge in challenges_data
+        ]
+
+    async def _fetch_challenge_data(
+        self,
+        challenges: List[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch leader and top 5 players for the given challenges in one query.
+
+        @param challenges: Challenge names to fetch
+        @return: Dictionary mapping challenge name to its challenge data
+        """
+        async with self.pool.reader() as db:
+            # Get the requested challenges with their top 5 players in one query
+            cursor = await db.execute(
+                self._stmts["challenge_data"],
+                (json.dumps(challenges),),
+            )
             results = await cursor.fetchall()
 
             # Transform results into structured data
-            challenges_data = {}
+            challenges_data: Dict[str, Dict[str, Any]] = {}
 
             for row in results:
-                (
-                    challenge,
-                    player,
-                    score,
-                    timestamp,
-                    solve_code,
-                    rank,
-                    leader_name,
-                    leader_score,
-                ) = row
-
-                if challenge not in challenges_data:
-                    challenges_data[challenge] = {
+                challenge = row["challenge"]
+
+                challenge_data = challenges_data.get(challenge)
+                if challenge_data is None:
+                    leader_name = row["leader_name"]
+                    challenge_data = challenges_data[challenge] = {
                         "name": challenge,
-                        "leader": {"name": leader_name, "score": leader_score}
+                        "leader": {"name": leader_name, "score": row["leader_score"]}
                         if leader_name
                         else None,
-                        "top5": [],
+                        # Parallel columns, one list per field, indexed by position
+                        "top5": {
+                            "rank": [],
+                            "player": [],
+                            "score": [],
+                            "timestamp": [],
+                            "solve_code": [],
+                            "is_tied": [],
+                        },
                     }
 
-                # Add to top5 list
-                challenges_data[challenge]["top5"].append(
-                    {
-                        "rank": rank,
-                        "player": player,
-                        "score": score,
-                        "timestamp": timestamp,
-                        "solve_code": solve_code,
-                        "is_tied": False,  # Will calculate ties later
-                    }
-                )
-
-            # Calculate ties for each challenge
-            for challenge_data in challenges_data.values():
+                # Add to top5 columns
                 top5 = challenge_data["top5"]
+                top5["rank"].append(row["rank"])
+                top5["player"].append(row["player_name"])
+                top5["score"].append(row["score"])
+                top5["timestamp"].append(row["timestamp"])
+                top5["solve_code"].append(row["solve_code"])
+                top5["is_tied"].append(bool(row["is_tied"]))
 
-                if len(top5) > 1:
-                    for i, entry in enumerate(top5):
-                        # Check if tied with previous or next entry
-                        is_tied = False
-
-                        if i > 0 and top5[i - 1]["score"] == entry["score"]:
-                            is_tied = True
-                        if i < len(top5) - 1 and top5[i + 1]["score"] == entry["score"]:
-                            is_tied = True
-                        entry["is_tied"] = is_tied
-
-            result = list(challenges_data.values())
-            # Cache the result
-            self._set_cache(cache_key, result)
-            return result
+            return challenges_data
 
     async def get_player_rankings(self) -> List[Dict[str, Any]]:
         """
@@ -422,7 +767,14 @@ class DatabaseManager:
 
         @return: List of dictionaries with player ranking information
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        cache_key = self._get_cache_key("player_rankings")
+        cached_data = self._get_from_cache(cache_key)
+
+        if cached_data is not None:
+            return cached_data
+
+        generation = self._cache_generation
+        async with self.pool.reader() as db:
             cursor = await db.execute("""
                 SELECT 
                     player_name,
@@ -437,30 +789,27 @@ class DatabaseManager:
             """)
             results = await cursor.fetchall()
 
-            # Add ranking
-            ranked_players = []
-
-            for rank, (
-                player,
-                challenges,
-                total,
-                avg,
-                best,
-                last_activity,
-            ) in enumerate(results, 1):
-                ranked_players.append(
-                    {
-                        "rank": rank,
-                        "player": player,
-                        "challenges_solved": challenges,
-                        "total_score": total,
-                        "avg_score": round(avg, 1),
-                        "best_score": best,
-                        "last_activity": last_activity,
-                    }
-                )
-
-            return ranked_players
+        # Add ranking
+        ranked_players = [
+            {
+                "rank": rank,
+                "player": row["player_name"],
+                "challenges_solved": row["challenges_solved"],
+                "total_score": row["total_score"],
+                "avg_score": round(row["avg_score"], 1),
+                "best_score": row["best_score"],
+                "last_activity": row["last_activity"],
+            }
+            for rank, row in enumerate(results, 1)
+        ]
+
+        self._set_cache(
+            cache_key,
+            ranked_players,
+            ttl=self._ttl_policy["player_rankings"],
+            generation=generation,
+        )
+        return ranked_players
 
     async def get_player_details(
         self,
@@ -470,15 +819,19 @@ class DatabaseManager:
         Get detailed information about a specific player's solutions.
 
         @param player_name: Name of the player to get details for
-        @return: List of tuples containing challenge details for the player
+        @return: List of tuples containing challenge details for the player,
+            with the timestamp already formatted as "YYYY-MM-DD HH:MM"
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.reader() as db:
+            # Format in SQL so only the displayed minutes prefix crosses over;
+            # ordering still uses the full stored timestamp
             cursor = await db.execute(
                 """
-                SELECT challenge, score, solve_code, timestamp
+                SELECT challenge, score, solve_code,
+                    strftime('%Y-%m-%d %H:%M', timestamp) AS timestamp
                 FROM scores 
                 WHERE player_name = ?
-                ORDER BY score ASC, timestamp DESC
+                ORDER BY score ASC, scores.timestamp DESC
             """,
                 (player_name,),
             )
@@ -496,35 +849,37 @@ class DatabaseManager:
         print("COMPLETE SCOREBOARD")
         print("=" * 50)
 
-        # Single query to get all data at once
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
-            cursor = await db.execute("""
-                SELECT challenge, player_name, score, timestamp, client_ip
-                FROM scores 
-                ORDER BY challenge, score ASC, timestamp ASC
-            """)
-            all_scores = await cursor.fetchall()
-
-        if not all_scores:
-            print("Scoreboard is empty")
-            return
-
+        # Single query, streamed row by row instead of materialized
+        saw_any = False
         current_challenge = None
         position = 0
 
-        for challenge, player, score, timestamp, client_ip in all_scores:
-            if challenge != current_challenge:
-                current_challenge = challenge
-                position = 0
-                print(f"\nLab {challenge}:")
-                print("-" * 20)
+        async with self.pool.reader() as db:
+            async with db.execute("""
+                SELECT challenge, player_name, score, timestamp, client_ip
+                FROM scores 
+                ORDER BY challenge, score ASC, timestamp ASC
+            """) as cursor:
+                async for row in cursor:
+                    saw_any = True
+                    challenge = row["challenge"]
+                    timestamp = row["timestamp"]
+                    client_ip = row["client_ip"]
+
+                    if challenge != current_challenge:
+                        current_challenge = challenge
+                        position = 0
+                        print(f"\nLab {challenge}:")
+                        print("-" * 20)
+
+                    position += 1
+                    timestamp_str = timestamp[:19] if timestamp else "Unknown"
+                    client_ip_str = client_ip if client_ip else "Unknown"
 
-            position += 1
-            timestamp_str = timestamp[:19] if timestamp else "Unknown"
-            client_ip_str = client_ip if client_ip else "Unknown"
+                    print(
+                        f"{position:2d}. {row['player_name']:<15} Score: {row['score']:4d} "
+                        f"({timestamp_str}) [{client_ip_str}]"
+                    )
 
-            print(
-                f"{position:2d}. {player:<15} Score: {score:4d} "
-                f"({timestamp_str}) [{client_ip_str}]"
-            )
+        if not saw_any:
+            print("Scoreboard is empty")
@@ -2,6 +2,12 @@
 Main ScoreboardSystem class that orchestrates all components.
 """
 
+import asyncio
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
 from typing import Optional
 from aiohttp import web, web_runner
 import aiohttp_cors
@@ -12,9 +18,37 @@ from .web_handlers import WebHandlers
 from .tcp_server import TCPServer
 
 
+def setup_logging() -> None:
+    """
+    Route scoreboard log records through a queue to a background thread.
+
+    Handlers run on the listener thread, so formatting and console writes
+    never block the event loop. Safe to call more than once per process.
+    """
+    logger = logging.getLogger("scoreboard")
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers):
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+
+    listener = logging.handlers.QueueListener(log_queue, console)
+    listener.start()
+    # Stopping the listener flushes any records still queued at exit
+    atexit.register(listener.stop)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
 class ScoreboardSystem:
     """Async scoreboard system with TCP and web interfaces."""
 
+    # Browser cache lifetime for /static/ assets, in seconds
+    STATIC_CACHE_MAX_AGE = 86400
+
     def __init__(
         self,
         host: str = "0.0.0.0",
@@ -29,6 +63,8 @@ class ScoreboardSystem:
         self.db_path = db_path
         self.running = False
 
+        setup_logging()
+
         # Load configuration
         self.config = CTFConfig(config_path)
         # Initialize components
@@ -44,6 +80,22 @@ class ScoreboardSystem:
         """
         await self.db.init_db()
 
+    async def _set_static_cache_headers(
+        self,
+        request: web.Request,
+        response: web.StreamResponse,
+    ) -> None:
+        """
+        Let browsers cache static assets instead of revalidating on every page.
+
+        @param request: Request being answered
+        @param response: Response about to be sent
+        """
+        if request.path.startswith("/static/") and response.status == 200:
+            response.headers["Cache-Control"] = (
+                f"public, max-age={self.STATIC_CACHE_MAX_AGE}"
+            )
+
     async def start_web_server(
         self,
         host: str = "localhost",
@@ -74,8 +126,9 @@ class ScoreboardSystem:
             },
         )
 
-        # Static files route
+        # Static files route; aiohttp's FileResponse already uses sendfile(2)
         app.router.add_static("/static/", path="src/static", name="static")
+        app.on_response_prepare.append(self._set_static_cache_headers)
 
         # Web routes
         app.router.add_get("/", self.web_handlers.web_index)
@@ -148,9 +201,11 @@ class ScoreboardSystem:
         if web_port is None:
             web_port = self.web_port
 
-        # Start both servers
-        socket_server = await self.start_socket_server(socket_host, socket_port)
-        web_server_runner = await self.start_web_server(web_host, web_port)
+        # Start both servers; they are independent, so bring them up concurrently
+        socket_server, web_server_runner = await asyncio.gather(
+            self.start_socket_server(socket_host, socket_port),
+            self.start_web_server(web_host, web_port),
+        )
 
         print("\nScoreboard System Running!")
         print(f"Socket Server: {socket_host}:{socket_port}")
@@ -166,6 +221,7 @@ class ScoreboardSystem:
             socket_server.close()
             await socket_server.wait_closed()
             await web_server_runner.cleanup()
+            await self.db.close()
 
     async def print_full_scoreboard(self) -> None:
         """
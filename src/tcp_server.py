@@ -3,8 +3,71 @@ TCP server for CTF scoreboard submissions.
 """
 
 import asyncio
-from typing import Any
-from .web_handlers import WebHandlers
+import socket
+import struct
+from typing import Any, List, Optional, Tuple, cast
+from .web_handlers import calculate_ranks_with_ties
+
+# Fixed replies to rejected submissions, sent as-is
+ERR_FORMAT_REQUIRED = b"Error: Invalid message format. Expected: name,challenge,score,solve_code\n"
+ERR_FORMAT_OPTIONAL = b"Error: Invalid message format. Expected: name,challenge,score[,solve_code]\n"
+ERR_TOO_MANY_FIELDS = b"Error: Too many fields in message\n"
+ERR_NAME_EMPTY = b"Error: Name cannot be empty\n"
+ERR_NAME_LONG = b"Error: Name too long (max 30 characters)\n"
+ERR_LAB_EMPTY = b"Error: Lab number cannot be empty\n"
+ERR_SOLVE_EMPTY = b"Error: Solve code cannot be empty\n"
+ERR_SCORE_NEGATIVE = b"Error: Score must be non-negative\n"
+ERR_SCORE_INT = b"Error: Score must be a valid integer\n"
+ERR_ENCODING = b"Error: Invalid character encoding\n"
+ERR_FRAME_TOO_LARGE = b"Error: Submission too large\n"
+ERR_SERVER = b"Server error occurred\n"
+
+# Largest value a SQLite INTEGER column can store
+SQLITE_MAX_INTEGER = 2**63 - 1
+
+# Framed submissions: each is a 4-byte big-endian length, then the body.
+# Any length under 16 MiB starts with a NUL byte, which plain-text
+# submissions never do, so the first byte of a connection picks the mode.
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 65536
+
+
+def encode_frame(body: bytes) -> bytes:
+    """
+    Prefix a message with its length for the framed protocol.
+
+    @param body: Message bytes
+    @return: Length header followed by the body
+    """
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+def split_frames(buffer: bytearray) -> Tuple[List[bytes], bool]:
+    """
+    Remove every complete frame from the front of a receive buffer.
+
+    A trailing partial frame is left in the buffer for the next read.
+
+    @param buffer: Bytes received so far; consumed frames are deleted
+    @return: Bodies of the complete frames in order, and True if the next
+        frame header announces more than MAX_FRAME_SIZE bytes
+    """
+    frames = []
+    offset = 0
+    header_size = FRAME_HEADER.size
+    too_large = False
+    while len(buffer) - offset >= header_size:
+        (size,) = FRAME_HEADER.unpack_from(buffer, offset)
+        if size > MAX_FRAME_SIZE:
+            too_large = True
+            break
+        end = offset + header_size + size
+        if len(buffer) < end:
+            break
+        frames.append(bytes(buffer[offset + header_size : end]))
+        offset = end
+    del buffer[:offset]
+    return frames, too_large
 
 
 class TCPServer:
@@ -17,9 +80,11 @@ class TCPServer:
     ) -> None:
         self.db = db_manager
         self.config = config
+        # Checked on every submission, so look it up once here
+        self.require_solutions = bool(self.config.get("submission", "require_solutions"))
 
         # Welcome message for TCP clients (configurable based on solution requirements)
-        if self.config.get("submission", "require_solutions"):
+        if self.require_solutions:
             format_msg = "name,challenge,score,solve_code"
         else:
             format_msg = "name,challenge,score[,solve_code]"
@@ -28,26 +93,88 @@ class TCPServer:
         welcome_text = f"Welcome to {ctf_name}! Please submit your credentials in format: {format_msg}\n"
         self.welcome_msg = welcome_text.encode("ascii")
 
+        # Submissions waiting for the next batched database write
+        self._pending_scores: List[
+            Tuple[Tuple[str, str, int, str, str], asyncio.Future]
+        ] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def queue_score(
+        self,
+        name: str,
+        lab_number: str,
+        score: int,
+        solve_code: str,
+        client_ip: str,
+    ) -> None:
+        """
+        Queue a score for the next batched write and wait until it is committed.
+
+        Submissions arriving while a write is in flight are coalesced into
+        the following save_scores_many call, so a burst costs one commit per
+        batch instead of one per submission.
+
+        @param name: Name of the player
+        @param lab_number: Challenge/lab identifier
+        @param score: Numeric score value
+        @param solve_code: Solution code provided by player
+        @param client_ip: IP address of the client
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending_scores.append(
+            ((name, lab_number, score, solve_code, client_ip), future)
+        )
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_scores())
+
+        await future
+
+    async def _flush_scores(self) -> None:
+        """
+        Write queued scores in batches until the queue is empty.
+        """
+        while self._pending_scores:
+            batch, self._pending_scores = self._pending_scores, []
+
+            try:
+                await self.db.save_scores_many([record for record, _ in batch])
+            except Exception:
+                # One bad record fails the whole batch; retry them one at a
+                # time so only the offending submission sees the error
+                for record, future in batch:
+                    try:
+                        await self.db.save_scores_many([record])
+                    except Exception as e:
+                        if not future.done():
+                            future.set_exception(e)
+                    else:
+                        if not future.done():
+                            future.set_result(None)
+            else:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+
     async def get_scoreboard_response(
         self,
         lab_number: str,
-    ) -> str:
+    ) -> bytes:
         """
         Generate scoreboard response for a specific lab (compatibility method).
 
         @param lab_number: Challenge/lab identifier to get scoreboard for
-        @return: Formatted string containing the scoreboard
+        @return: ASCII-encoded scoreboard, ready to write to the client
         """
         leaderboard_data = await self.db.get_challenge_leaderboard(lab_number, 10)
 
         if not leaderboard_data:
-            return f"Lab {lab_number} Scoreboard:\nNo entries yet!\n"
+            return f"Lab {lab_number} Scoreboard:\nNo entries yet!\n".encode("ascii")
 
-        response = f"Lab {lab_number} Scoreboard:\n"
-        response += "=" * 30 + "\n"
+        # Collect lines and join once instead of growing a string per row
+        lines = [f"Lab {lab_number} Scoreboard:\n", "=" * 30 + "\n"]
 
-        web_handler = WebHandlers(self.db, self.config)
-        ranked_leaderboard = web_handler.calculate_ranks_with_ties(leaderboard_data)
+        ranked_leaderboard = calculate_ranks_with_ties(leaderboard_data)
 
         for entry in ranked_leaderboard:
             timestamp_str = entry["timestamp"][:19] if entry["timestamp"] else "Unknown"
@@ -55,121 +182,83 @@ class TCPServer:
             rank = entry["rank"]
             player = entry["player"]
             score = entry["score"]
-            response += (
+            lines.append(
                 f"{rank:2d}. {player:<15} "
                 f"Score: {score:4d} ({timestamp_str}){tie_indicator}\n"
             )
 
         if len(leaderboard_data) == 10:
             # Check if there are more entries
-            all_entries = await self.db.get_challenge_leaderboard(lab_number, 1000)
-            if len(all_entries) > 10:
-                response += f"... and {len(all_entries) - 10} more entries\n"
+            entry_count = await self.db.get_challenge_entry_count(lab_number)
+            if entry_count > 10:
+                lines.append(f"... and {entry_count - 10} more entries\n")
 
-        return response
+        return "".join(lines).encode("ascii")
 
-    async def handle_socket_client(
+    async def process_submission(
         self,
-        reader: asyncio.StreamReader,
-        writer: asyncio.StreamWriter,
-    ) -> None:
+        data: bytes,
+        client_ip: str = "",
+    ) -> bytes:
         """
-        Handle individual TCP client connection (async).
+        Validate one raw submission, save it and build the reply.
 
-        Processes score submissions from TCP clients, validates data,
-        and returns formatted scoreboard responses.
-
-        @param reader: AsyncIO stream reader for client connection
-        @param writer: AsyncIO stream writer for client connection
+        @param data: Bytes received from the client
+        @param client_ip: IP address of the client (optional)
+        @return: Reply to send back: the challenge scoreboard or an error line
         """
-        client_addr = writer.get_extra_info("peername")
-        print(f"Socket client connected: {client_addr}")
+        # Parse client message: "name,challenge,score[,solve_code]"
+        # One C-level check replaces decoding the whole buffer up front
+        if not data.isascii():
+            return ERR_ENCODING
 
-        try:
-            # Send welcome message
-            writer.write(self.welcome_msg)
-            await writer.drain()
+        # Trim padding and whitespace, then split into max 4 parts to allow
+        # commas in solve code; the fields stay bytes until they are used
+        parts = data.strip(b"\x00").strip().split(b",", 3)
 
-            # Receive client data (read until newline or up to 1024 bytes)
-            data = await reader.read(1024)
-            if not data:
-                print(f"No data received from {client_addr}")
-                return
+        require_solutions = self.require_solutions
 
-            # Parse client message: "name,challenge,score[,solve_code]"
-            try:
-                message = data.decode("ascii").strip("\x00").strip()
-                parts = message.split(
-                    ",", 3
-                )  # Split into max 4 parts to allow commas in solve code
-
-                require_solutions = self.config.get("submission", "require_solutions")
-
-                if require_solutions and len(parts) != 4:
-                    response = "Error: Invalid message format. Expected: name,challenge,score,solve_code\n"
-                elif not require_solutions and len(parts) < 3:
-                    response = "Error: Invalid message format. Expected: name,challenge,score[,solve_code]\n"
-                elif not require_solutions and len(parts) > 4:
-                    response = "Error: Too many fields in message\n"
-                else:
-                    name = parts[0].strip()
-                    lab_number = parts[1].strip()
-                    score_str = parts[2].strip()
-                    solve_code = (
-                        parts[3].strip() if len(parts) > 3 else "No solution provided"
-                    )
-
-                    # Validate inputs according to protocol specs
-                    if not name:
-                        response = "Error: Name cannot be empty\n"
-                    elif len(name) > 30:
-                        response = "Error: Name too long (max 30 characters)\n"
-                    elif not lab_number:
-                        response = "Error: Lab number cannot be empty\n"
-                    elif require_solutions and not solve_code:
-                        response = "Error: Solve code cannot be empty\n"
-                    else:
-                        try:
-                            score = int(score_str)
-                            if score < 0:
-                                response = "Error: Score must be non-negative\n"
-                            else:
-                                # Add to scoreboard
-                                client_ip = client_addr[0] if client_addr else ""
-                                await self.db.save_score(
-                                    name, lab_number, score, solve_code, client_ip
-                                )
-                                # Generate formatted scoreboard response
-                                response = await self.get_scoreboard_response(
-                                    lab_number
-                                )
-                        except ValueError:
-                            response = "Error: Score must be a valid integer\n"
-
-            except UnicodeDecodeError:
-                response = "Error: Invalid character encoding\n"
-
-            # Send response
-            response_bytes = response.encode("ascii")
-            writer.write(response_bytes)
-            await writer.drain()
-
-        except (ConnectionError, OSError, UnicodeDecodeError) as e:
-            print(f"Error handling socket client {client_addr}: {e}")
-            try:
-                error_msg = "Server error occurred\n"
-                writer.write(error_msg.encode("ascii"))
-                await writer.drain()
-            except (ConnectionError, OSError):
-                pass
+        if require_solutions and len(parts) != 4:
+            return ERR_FORMAT_REQUIRED
+        elif not require_solutions and len(parts) < 3:
+            return ERR_FORMAT_OPTIONAL
+        elif not require_solutions and len(parts) > 4:
+            return ERR_TOO_MANY_FIELDS
 
-        finally:
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except (ConnectionError, OSError):
-                pass
-            print(f"Socket client disconnected: {client_addr}")
+        name_b = parts[0].strip()
+        lab_b = parts[1].strip()
+        code_b = parts[3].strip() if len(parts) > 3 else None
+
+        # Validate inputs according to protocol specs; ASCII bytes have the
+        # same lengths as the decoded text, so rejects never decode
+        if not name_b:
+            return ERR_NAME_EMPTY
+        elif len(name_b) > 30:
+            return ERR_NAME_LONG
+        elif not lab_b:
+            return ERR_LAB_EMPTY
+        elif require_solutions and not code_b:
+            return ERR_SOLVE_EMPTY
+
+        try:
+            score = int(parts[2])  # int() parses ASCII digits from bytes directly
+        except ValueError:
+            return ERR_SCORE_INT
+        if score < 0:
+            return ERR_SCORE_NEGATIVE
+        if score > SQLITE_MAX_INTEGER:
+            return ERR_SCORE_INT
+
+        name = name_b.decode("ascii")
+        lab_number = lab_b.decode("ascii")
+        solve_code = (
+            code_b.decode("ascii") if code_b is not None else "No solution provided"
+        )
+
+        # Add to scoreboard
+        await self.queue_score(name, lab_number, score, solve_code, client_ip)
+        # Generate formatted scoreboard response
+        return await self.get_scoreboard_response(lab_number)
 
     async def start_tcp_server(
         self,
@@ -183,7 +272,246 @@ class TCPServer:
         @param port: Port number to listen on (default 8080)
         @return: TCP server instance
         """
-        server = await asyncio.start_server(self.handle_socket_client, host, port)
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(
+            lambda: SubmissionProtocol(self), host, port
+        )
+
+        # Accepted sockets inherit these from the listener, so there is no
+        # per-connection setsockopt. asyncio also sets TCP_NODELAY on each
+        # transport; setting it here keeps small replies unbatched regardless.
+        for listen_sock in server.sockets:
+            listen_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            listen_sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
         print(f"Socket server running on {host}:{port}")
 
         return server
+
+
+class SubmissionProtocol(asyncio.BufferedProtocol):
+    """
+    Per-connection protocol: welcome, then either one plain submission or
+    any number of framed ones, each answered with a reply.
+
+    The transport reads straight into a preallocated buffer, so a plain
+    submission is copied once, when it is handed to the parser.
+    """
+
+    # Largest plain submission read from a client, matching the original read(1024)
+    BUFFER_SIZE = 1024
+    # Framed submissions parsed but not yet answered before reading pauses
+    MAX_PENDING_FRAMES = 64
+
+    def __init__(
+        self,
+        server: TCPServer,
+    ) -> None:
+        self.server = server
+        self.transport: asyncio.Transport  # Set in connection_made
+        self.client_addr: Any = None
+        self._buffer = memoryview(bytearray(self.BUFFER_SIZE))
+        self._task: Optional[asyncio.Task] = None
+        # Framed mode state; _framed stays None until the first byte arrives
+        self._framed: Optional[bool] = None
+        self._frame_buffer = bytearray()
+        self._frames: List[bytes] = []
+        self._frame_error: Optional[bytes] = None
+        self._eof = False
+        self._paused = False
+        # Cleared while the transport's write buffer is over its high-water mark
+        self._can_write = asyncio.Event()
+        self._can_write.set()
+
+    def connection_made(
+        self,
+        transport: asyncio.BaseTransport,
+    ) -> None:
+        """
+        Greet the client as soon as it connects.
+
+        @param transport: Transport for the new connection
+        """
+        # create_server always hands stream protocols a full Transport
+        self.transport = cast(asyncio.Transport, transport)
+        self.client_addr = transport.get_extra_info("peername")
+        print(f"Socket client connected: {self.client_addr}")
+        self.transport.write(self.server.welcome_msg)
+
+    def get_buffer(
+        self,
+        sizehint: int,
+    ) -> memoryview:
+        """
+        Hand the transport the preallocated receive buffer.
+
+        @param sizehint: Suggested minimum size (ignored; the buffer is fixed)
+        @return: Writable view of the receive buffer
+        """
+        return self._buffer
+
+    def buffer_updated(
+        self,
+        nbytes: int,
+    ) -> None:
+        """
+        Process received bytes as a plain submission or as frames.
+
+        @param nbytes: Number of bytes written into the buffer
+        """
+        if self._framed is None:
+            self._framed = self._buffer[0] == 0
+
+        if self._framed:
+            self._frame_buffer += self._buffer[:nbytes]
+            frames, too_large = split_frames(self._frame_buffer)
+            self._frames += frames
+            if too_large:
+                # Answer what was already parsed, then report and close
+                self._frame_error = ERR_FRAME_TOO_LARGE
+                self._pause()
+            elif len(self._frames) >= self.MAX_PENDING_FRAMES:
+                self._pause()
+            if self._task is None and (self._frames or self._frame_error):
+                self._task = asyncio.get_running_loop().create_task(
+                    self._respond_frames()
+                )
+            return
+
+        if self._task is not None:
+            return  # One plain submission per connection; ignore anything after it
+
+        self.transport.pause_reading()
+        data = bytes(self._buffer[:nbytes])
+        self._task = asyncio.get_running_loop().create_task(self._respond(data))
+
+    def eof_received(self) -> bool:
+        """
+        Handle the client closing its sending side.
+
+        @return: True to keep the connection open for a pending reply
+        """
+        self._eof = True
+        if self._task is None:
+            if not self._framed:
+                print(f"No data received from {self.client_addr}")
+            return False
+        return True
+
+    def connection_lost(
+        self,
+        exc: Optional[Exception],
+    ) -> None:
+        """
+        Log the disconnect.
+
+        @param exc: Error that closed the connection, or None on a clean close
+        """
+        self._can_write.set()  # Wake a reply task waiting on a dead connection
+        print(f"Socket client disconnected: {self.client_addr}")
+
+    def pause_writing(self) -> None:
+        """
+        Hold back framed replies while the client is not reading them.
+        """
+        self._can_write.clear()
+
+    def resume_writing(self) -> None:
+        """
+        Let framed replies flow again and resume reading if it was held.
+        """
+        self._can_write.set()
+        self._resume()
+
+    def _pause(self) -> None:
+        """
+        Stop reading from the client until queued frames are answered.
+        """
+        if not self._paused:
+            self._paused = True
+            self.transport.pause_reading()
+
+    def _resume(self) -> None:
+        """
+        Resume reading once queued frames are taken and replies can be sent.
+        """
+        if (
+            self._paused
+            and self._frame_error is None
+            and self._can_write.is_set()
+            and len(self._frames) < self.MAX_PENDING_FRAMES
+        ):
+            self._paused = False
+            self.transport.resume_reading()
+
+    async def _respond(
+        self,
+        data: bytes,
+    ) -> None:
+        """
+        Run the submission through the server and send the reply.
+
+        @param data: Submission bytes received from the client
+        """
+        try:
+            client_ip = self.client_addr[0] if self.client_addr else ""
+            self.transport.write(
+                await self.server.process_submission(data, client_ip)
+            )
+        except Exception as e:  # Includes database errors from saving the score
+            print(f"Error handling socket client {self.client_addr}: {e}")
+            self.transport.write(ERR_SERVER)
+        finally:
+            # Buffered data is flushed before the socket actually closes
+            self.transport.close()
+
+    async def _respond_frames(self) -> None:
+        """
+        Answer queued framed submissions in order until none are left.
+
+        The connection stays open for more frames until the client sends
+        EOF or breaks the framing.
+        """
+        client_ip = self.client_addr[0] if self.client_addr else ""
+        close = True
+        try:
+            while self._frames:
+                frames, self._frames = self._frames, []
+                self._resume()
+
+                # Submissions that arrived together share one batched write;
+                # a failed one gets an error reply without losing the others
+                replies = await asyncio.gather(
+                    *(
+                        self.server.process_submission(frame, client_ip)
+                        for frame in frames
+                    ),
+                    return_exceptions=True,
+                )
+                for reply in replies:
+                    if not isinstance(reply, bytes):
+                        print(f"Error handling socket client {self.client_addr}: {reply}")
+
+                # Don't pile replies onto a client that isn't reading them
+                await self._can_write.wait()
+                if self.transport.is_closing():
+                    return
+                self.transport.writelines(
+                    [
+                        encode_frame(reply if isinstance(reply, bytes) else ERR_SERVER)
+                        for reply in replies
+                    ]
+                )
+                self._resume()
+
+            if self._frame_error is not None:
+                self.transport.write(encode_frame(self._frame_error))
+            else:
+                close = self._eof
+        except Exception as e:  # Never leave the task's exception unretrieved
+            print(f"Error handling socket client {self.client_addr}: {e}")
+            self.transport.write(encode_frame(ERR_SERVER))
+        finally:
+            self._task = None
+            if close:
+                self.transport.close()
@@ -2,15 +2,88 @@
 Web route handlers for CTF scoreboard.
 """
 
-from datetime import datetime
-from typing import List, Dict, Any
+import hashlib
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import orjson
 from aiohttp import web
 from jinja2 import Environment, FileSystemLoader
 
 
+def json_response(data: Any) -> web.Response:
+    """
+    Build a JSON response serialized with orjson.
+
+    orjson encodes straight to UTF-8 bytes, so the body is sent as-is
+    without the str round trip of web.json_response.
+
+    @param data: JSON-serializable payload
+    @return: Response with an application/json body
+    """
+    return web.Response(body=orjson.dumps(data), content_type="application/json")
+
+
+# CSS class for each of the first three ranks, indexed by rank
+RANK_CLASSES = ("", "gold", "silver", "bronze")
+
+
+def calculate_ranks_with_ties(
+    leaderboard_data: List[Any],
+) -> List[Dict[str, Any]]:
+    """
+    Calculate ranks accounting for ties (same scores get same rank).
+
+    @param leaderboard_data: List of tuples containing player score data
+    @return: List of dictionaries with ranking information and tie indicators
+    """
+    if not leaderboard_data:
+        return []
+
+    # All rows come from one query, so the row format is checked once
+    has_solve_code = len(leaderboard_data[0]) == 4
+    scores = [entry[1] for entry in leaderboard_data]
+    last = len(scores) - 1
+
+    ranked_data = []
+    current_rank = 1
+
+    for i, entry in enumerate(leaderboard_data):
+        if has_solve_code:  # New format with solve_code
+            player, score, timestamp, solve_code = entry
+        else:  # Old format without solve_code
+            player, score, timestamp = entry
+            solve_code = "No solution provided"
+
+        # If this score is different from previous, update rank to current position
+        if i and score != scores[i - 1]:
+            current_rank = i + 1
+
+        ranked_data.append(
+            {
+                "rank": current_rank,
+                "rank_class": RANK_CLASSES[current_rank] if current_rank < 4 else "",
+                "player": player,
+                "score": score,
+                "timestamp": timestamp,
+                "solve_code": solve_code,
+                # Tied when a neighbour has the same score
+                "is_tied": (i > 0 and scores[i - 1] == score)
+                or (i < last and scores[i + 1] == score),
+            }
+        )
+
+    return ranked_data
+
+
 class WebHandlers:
     """Handles web routes and responses."""
 
+    # Seconds a rendered page may be served from memory; writes evict sooner
+    PAGE_CACHE_TTL = 30
+    # Least recently used pages are evicted beyond this many
+    PAGE_CACHE_MAX_ENTRIES = 256
+
     def __init__(
         self,
         db_manager: Any,
@@ -19,6 +92,10 @@ class WebHandlers:
     ) -> None:
         self.db = db_manager
         self.config = config
+        # Gates the player pages on every request; config is fixed at startup
+        self.player_rankings_enabled = self.config.is_feature_enabled(
+            "player_rankings_enabled"
+        )
 
         self.jinja_env = Environment(
             loader=FileSystemLoader(templates_path),
@@ -26,6 +103,121 @@ class WebHandlers:
             cache_size=50,  # Cache up to 50 templates
         )
 
+        # Compile each page template once; handlers render these directly
+        self.tmpl_index = self.jinja_env.get_template("index.html")
+        self.tmpl_challenge_detail = self.jinja_env.get_template("challenge_detail.html")
+        self.tmpl_player_rankings = self.jinja_env.get_template("player_rankings.html")
+        self.tmpl_player_details = self.jinja_env.get_template("player_details.html")
+
+        # LRU of rendered pages: name -> (data version, expiry, body, etag)
+        self._page_cache: "OrderedDict[str, Tuple[int, float, bytes, str]]" = OrderedDict()
+        # Data version of the entries in _page_cache; older ones are swept on insert
+        self._page_cache_version = 0
+
+    def _format_timestamp(
+        self,
+        timestamp: Optional[str],
+    ) -> str:
+        """
+        Format a stored timestamp as "YYYY-MM-DD HH:MM" for display.
+
+        SQLite stores ISO 8601 text, so the minutes prefix is sliced off
+        directly rather than parsed into a datetime.
+
+        @param timestamp: Timestamp string from the database
+        @return: Formatted timestamp, or "Unknown" if missing
+        """
+        if not timestamp:
+            return "Unknown"
+        return timestamp[:16].replace("T", " ")
+
+    def _page_response(
+        self,
+        request: web.Request,
+        body: bytes,
+        etag: str,
+    ) -> web.Response:
+        """
+        Build an HTML response, or 304 if the client already has this body.
+
+        @param request: HTTP request, checked for If-None-Match
+        @param body: Encoded HTML body
+        @param etag: Entity tag for the body
+        @return: HTTP response carrying the page or a 304 Not Modified
+        """
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+
+        return web.Response(
+            body=body,
+            content_type="text/html",
+            charset="utf-8",
+            headers={"ETag": etag},
+        )
+
+    def _get_cached_page(
+        self,
+        request: web.Request,
+        page: str,
+    ) -> Optional[web.Response]:
+        """
+        Serve a rendered page from memory if no score was saved since.
+
+        @param request: HTTP request being answered
+        @param page: Page cache name
+        @return: HTTP response if cached and current, None otherwise
+        """
+        entry = self._page_cache.get(page)
+        if entry is None:
+            return None
+
+        version, expires_at, body, etag = entry
+        if version != self.db.get_data_version() or time.monotonic() >= expires_at:
+            del self._page_cache[page]
+            return None
+
+        self._page_cache.move_to_end(page)
+        return self._page_response(request, body, etag)
+
+    def _cache_page(
+        self,
+        request: web.Request,
+        page: str,
+        version: int,
+        html: str,
+    ) -> web.Response:
+        """
+        Store a freshly rendered page and respond with it.
+
+        @param request: HTTP request being answered
+        @param page: Page cache name
+        @param version: Data version read before the page data was fetched
+        @param html: Rendered page
+        @return: HTTP response carrying the page
+        """
+        body = html.encode("utf-8")
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+        # A write during rendering may not be reflected; don't keep the page
+        if version == self.db.get_data_version():
+            if version != self._page_cache_version:
+                # Any write bumps the version, so every older page is stale
+                self._page_cache.clear()
+                self._page_cache_version = version
+
+            self._page_cache.pop(page, None)
+            while len(self._page_cache) >= self.PAGE_CACHE_MAX_ENTRIES:
+                self._page_cache.popitem(last=False)
+
+            self._page_cache[page] = (
+                version,
+                time.monotonic() + self.PAGE_CACHE_TTL,
+                body,
+                etag,
+            )
+
+        return self._page_response(request, body, etag)
+
     def calculate_ranks_with_ties(
         self,
         leaderboard_data: List[Any],
@@ -36,76 +228,30 @@ class WebHandlers:
         @param leaderboard_data: List of tuples containing player score data
         @return: List of dictionaries with ranking information and tie indicators
         """
-        if not leaderboard_data:
-            return []
-
-        ranked_data = []
-        current_rank = 1
-        previous_score = None
-
-        for i, entry in enumerate(leaderboard_data):
-            if len(entry) == 4:  # New format with solve_code
-                player, score, timestamp, solve_code = entry
-            else:  # Old format without solve_code
-                player, score, timestamp = entry
-                solve_code = "No solution provided"
-
-            # If this score is different from previous, update rank to current position
-            if previous_score is not None and score != previous_score:
-                current_rank = i + 1
-
-            # Determine rank class for styling
-            rank_class = ""
-            is_tied = False
-
-            # Check if this player is tied with others
-            if i > 0 and leaderboard_data[i - 1][1] == score:
-                is_tied = True
-            elif i < len(leaderboard_data) - 1 and leaderboard_data[i + 1][1] == score:
-                is_tied = True
-
-            # Set rank class based on actual rank position
-            if current_rank == 1:
-                rank_class = "gold"
-            elif current_rank == 2:
-                rank_class = "silver"
-            elif current_rank == 3:
-                rank_class = "bronze"
-
-            ranked_data.append(
-                {
-                    "rank": current_rank,
-                    "rank_class": rank_class,
-                    "player": player,
-                    "score": score,
-                    "timestamp": timestamp,
-                    "solve_code": solve_code,
-                    "is_tied": is_tied,
-                }
-            )
-
-            previous_score = score
-
-        return ranked_data
+        return calculate_ranks_with_ties(leaderboard_data)
 
     async def web_index(
         self,
-        _: web.Request,
+        request: web.Request,
     ) -> web.Response:
         """
         Web interface main page.
 
-        @param _: Unused request parameter
+        @param request: HTTP request object
         @return: HTTP response with rendered index page
         """
+        cached = self._get_cached_page(request, "index")
+        if cached is not None:
+            return cached
+
+        version = self.db.get_data_version()
         # Use optimized single-query method to get all challenge data
         challenges_data = await self.db.get_all_challenge_data_optimized()
 
-        template = self.jinja_env.get_template("index.html")
-        html = template.render(
+        html = self.tmpl_index.render(
             title="Home", challenges=challenges_data, config=self.config
         )
-        return web.Response(text=html, content_type="text/html")
+        return self._cache_page(request, "index", version, html)
 
     async def web_challenge_detail(
         self,
@@ -118,6 +264,12 @@ class WebHandlers:
         @return: HTTP response with rendered challenge detail page
         """
         challenge_name = request.match_info["challenge"]
+        page = f"challenge:{challenge_name}"
+        cached = self._get_cached_page(request, page)
+        if cached is not None:
+            return cached
+
+        version = self.db.get_data_version()
         leaderboard_data = await self.db.get_challenge_leaderboard(challenge_name, 50)
 
         # Calculate ranks with tie support
@@ -126,13 +278,7 @@ class WebHandlers:
         # Format timestamps
         leaderboard = []
         for entry in ranked_leaderboard:
-            try:
-                dt = datetime.fromisoformat(entry["timestamp"].replace("Z", "+00:00"))
-                formatted_date = dt.strftime("%Y-%m-%d %H:%M")
-            except (ValueError, TypeError):
-                formatted_date = (
-                    entry["timestamp"][:19] if entry["timestamp"] else "Unknown"
-                )
+            formatted_date = self._format_timestamp(entry["timestamp"])
 
             leaderboard.append(
                 {
@@ -146,40 +292,46 @@ class WebHandlers:
                 }
             )
 
-        template = self.jinja_env.get_template("challenge_detail.html")
-        html = template.render(
+        html = self.tmpl_challenge_detail.render(
             title=challenge_name,
             challenge_name=challenge_name,
             leaderboard=leaderboard,
             config=self.config,
         )
-        return web.Response(text=html, content_type="text/html")
+        # Only real challenges are kept, so arbitrary URLs can't grow the cache
+        if not leaderboard:
+            return web.Response(text=html, content_type="text/html")
+        return self._cache_page(request, page, version, html)
 
     async def web_player_rankings(
         self,
-        _: web.Request,
+        request: web.Request,
     ) -> web.Response:
         """
         Web interface player rankings page.
 
-        @param _: Unused request parameter
+        @param request: HTTP request object
         @return: HTTP response with rendered player rankings page or 404 if disabled
         """
         # Check if player rankings are enabled
-        if not self.config.is_feature_enabled("player_rankings_enabled"):
+        if not self.player_rankings_enabled:
             return web.Response(
                 text="Player rankings are disabled",
                 status=404,
                 content_type="text/plain",
             )
 
+        cached = self._get_cached_page(request, "player_rankings")
+        if cached is not None:
+            return cached
+
+        version = self.db.get_data_version()
         player_rankings = await self.db.get_player_rankings()
 
-        template = self.jinja_env.get_template("player_rankings.html")
-        html = template.render(
+        html = self.tmpl_player_rankings.render(
             title="Player Rankings", players=player_rankings, config=self.config
         )
-        return web.Response(text=html, content_type="text/html")
+        return self._cache_page(request, "player_rankings", version, html)
 
     async def web_player_details(
         self,
@@ -192,7 +344,7 @@ class WebHandlers:
         @return: HTTP response with rendered player details page or 404 if disabled
         """
         # Check if player rankings are enabled
-        if not self.config.is_feature_enabled("player_rankings_enabled"):
+        if not self.player_rankings_enabled:
             return web.Response(
                 text="Player details are disabled",
                 status=404,
@@ -200,17 +352,20 @@ class WebHandlers:
             )
 
         player_name = request.match_info["player"]
+        page = f"player:{player_name}"
+        cached = self._get_cached_page(request, page)
+        if cached is not None:
+            return cached
+
+        version = self.db.get_data_version()
         player_details = await self.db.get_player_details(player_name)
 
         # Format details for display
         challenges = []
 
         for challenge, score, solve_code, timestamp in player_details:
-            try:
-                dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                formatted_date = dt.strftime("%Y-%m-%d %H:%M")
-            except (ValueError, TypeError):
-                formatted_date = timestamp[:19] if timestamp else "Unknown"
+            # Already formatted by the query
+            formatted_date = timestamp or "Unknown"
 
             challenges.append(
                 {
@@ -221,15 +376,17 @@ class WebHandlers:
                 }
             )
 
-        template = self.jinja_env.get_template("player_details.html")
-        html = template.render(
+        html = self.tmpl_player_details.render(
             title=f"Player: {player_name}",
             player_name=player_name,
             challenges=challenges,
             config=self.config,
         )
 
-        return web.Response(text=html, content_type="text/html")
+        # Only known players are kept, so arbitrary URLs can't grow the cache
+        if not challenges:
+            return web.Response(text=html, content_type="text/html")
+        return self._cache_page(request, page, version, html)
 
     async def web_api_challenges(
         self,
@@ -242,7 +399,7 @@ class WebHandlers:
         @return: JSON response containing list of all challenges
         """
         challenges = await self.db.get_all_challenges()
-        return web.json_response({"challenges": challenges})
+        return json_response({"challenges": challenges})
 
     async def web_api_leaderboard(
         self,
@@ -258,7 +415,7 @@ class WebHandlers:
         limit = int(request.query.get("limit", 10))
         leaderboard = await self.db.get_challenge_leaderboard(challenge, limit)
 
-        return web.json_response(
+        return json_response(
             {
                 "challenge": challenge,
                 "leaderboard": [
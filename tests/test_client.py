@@ -4,215 +4,181 @@ Test client to generate test data for the scoreboard system.
 Creates 50 different labs with multiple players and random scores.
 """
 
+import asyncio
+import contextlib
 import socket
-import time
 import random
-
-
-def send_score(server_host, server_port, player_name, lab_name, score, solve_code):
-    """Send a single score to the scoreboard server."""
-    try:
-        client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        client_socket.connect((server_host, server_port))
-
-        # Receive welcome message
-        client_socket.recv(1024)  # Welcome message (not used)
-
-        # Send score (no padding required)
-        test_message = f"{player_name},{lab_name},{score},{solve_code}\n"
-        client_socket.send(test_message.encode("ascii"))
-
-        # Receive response
-        client_socket.recv(4096)  # Response (not used)
-
-        client_socket.close()
-        return True
-
-    except (ConnectionError, OSError) as e:
-        print(f"Error sending score: {e}")
-        return False
-
-
-def generate_test_data(
-    server_host="localhost",
-    server_port=8080,
-):
-    """Generate comprehensive test data for the scoreboard."""
-
-    first_names = [
-        "Alice",
-        "Bob",
-        "Charlie",
-        "Diana",
-        "Eve",
-        "Frank",
-        "Grace",
-        "Henry",
-        "Ivy",
-        "Jack",
-        "Kate",
-        "Leo",
-        "Maya",
-        "Noah",
-        "Olivia",
-        "Paul",
-        "Quinn",
-        "Ruby",
-        "Sam",
-        "Tina",
-        "Uma",
-        "Victor",
-        "Wendy",
-        "Xander",
-        "Yara",
-        "Zoe",
-        "Adam",
-        "Bella",
-        "Carl",
-        "Delia",
-        "Ethan",
-        "Fiona",
-        "George",
-        "Hannah",
-        "Ian",
-        "Julia",
-        "Kevin",
-        "Luna",
-        "Max",
-        "Nina",
-        "Oscar",
-        "Penny",
-        "Quincy",
-        "Rachel",
-        "Steve",
-        "Tessa",
-        "Ulrich",
-        "Vera",
-        "Will",
-        "Ximena",
-        "York",
-        "Zara",
-    ]
-
-    challenge_names = [
-        "RSA_Baby",
-        "AES_Master",
-        "Hash_Cracker",
-        "DiffieHell",
-        "ECC_Curve",
-        "SQLi_Basic",
-        "XSS_Hunter",
-        "CSRF_Token",
-        "JWT_Forge",
-        "LFI_Path",
-        "BuffOver",
-        "ROP_Chain",
-        "Format_Str",
-        "HeapSpray",
-        "Stack_Canary",
-        "RE_Basics",
-        "Unpack_Me",
-        "Anti_Debug",
-        "VM_Detect",
-        "Code_Cave",
-        "Zip_Bomb",
-        "QR_Hidden",
-        "Audio_Spec",
-        "Polyglot",
-        "Base64_Nest",
-        "LSB_Hide",
-        "Pixel_Art",
-        "PNG_Secret",
-        "JPEG_Meta",
-        "GIF_Frame",
-        "Google_Fu",
-        "LinkedIn",
-        "Username",
-        "Email_Hunt",
-        "Geo_Photo",
-        "Disk_Image",
-        "Memory_Dump",
-        "Network_Cap",
-        "Log_Analysis",
-        "File_Carv",
-        "Blind_SQL",
-        "XXE_Parse",
-        "SSTI_Jinja",
-        "Deserialization",
-        "Race_Cond",
-        "Use_After_Free",
-        "Double_Free",
-        "Integer_Over",
-        "Path_Traverse",
-        "Command_Inj",
-    ]
-
-    labs = challenge_names.copy()
-
-    print(f"Generating test data for {len(labs)} labs...")
-    print("Sample lab names:", labs[:10])
-
-    total_entries = 0
-
-    for lab_name in labs:
-        num_players = random.randint(3, 15)
-        lab_players = random.sample(first_names, min(num_players, len(first_names)))
-
-        print(f"Creating {num_players} entries for {lab_name}...")
-
-        for player_name in lab_players:
-            base_score = random.randint(1, 300)
-
-            if random.random() < 0.15:  # 15% chance of tie
-                tie_scores = [10, 25, 50, 100, 150, 200]
-                base_score = random.choice(tie_scores)
-
-            # Generate a realistic solve code based on challenge type
-            solve_codes = [
-                f"print('Hello {lab_name}!')",
-                f"import requests; r = requests.get('/{lab_name.lower()}')",
-                f"curl -X POST /api/{lab_name.lower()}",
-                f"SELECT * FROM {lab_name.lower()} WHERE id=1",
-                f"python exploit_{lab_name.lower()}.py",
-                f"nc target.com 1337 < payload_{lab_name}.txt",
-                f"./solve_{lab_name.lower()}.sh",
-                f"echo 'flag{{solved_{lab_name.lower()}}}' | base64",
-                f"openssl enc -d -aes256 < {lab_name.lower()}.enc",
-                f"john --wordlist=rockyou.txt {lab_name.lower()}.hash",
-                # Multi-line Python exploit
-                f"""#!/usr/bin/env python3
+import struct
+
+# Connections the generated submissions are spread over
+FRAMED_CONNECTIONS = 8
+
+# Framed submissions: 4-byte big-endian length, then the body
+FRAME_HEADER = struct.Struct(">I")
+
+# Reply prefixes for rejected submissions and server-side failures
+ERROR_REPLY_PREFIXES = (b"Error", b"Server error")
+
+# Seconds to wait on the server for one submission before giving up
+SEND_TIMEOUT = 2.0
+
+
+# Player names drawn for each challenge
+FIRST_NAMES = (
+    "Alice",
+    "Bob",
+    "Charlie",
+    "Diana",
+    "Eve",
+    "Frank",
+    "Grace",
+    "Henry",
+    "Ivy",
+    "Jack",
+    "Kate",
+    "Leo",
+    "Maya",
+    "Noah",
+    "Olivia",
+    "Paul",
+    "Quinn",
+    "Ruby",
+    "Sam",
+    "Tina",
+    "Uma",
+    "Victor",
+    "Wendy",
+    "Xander",
+    "Yara",
+    "Zoe",
+    "Adam",
+    "Bella",
+    "Carl",
+    "Delia",
+    "Ethan",
+    "Fiona",
+    "George",
+    "Hannah",
+    "Ian",
+    "Julia",
+    "Kevin",
+    "Luna",
+    "Max",
+    "Nina",
+    "Oscar",
+    "Penny",
+    "Quincy",
+    "Rachel",
+    "Steve",
+    "Tessa",
+    "Ulrich",
+    "Vera",
+    "Will",
+    "Ximena",
+    "York",
+    "Zara",
+)
+
+# Challenge names, one lab per entry
+CHALLENGE_NAMES = (
+    "RSA_Baby",
+    "AES_Master",
+    "Hash_Cracker",
+    "DiffieHell",
+    "ECC_Curve",
+    "SQLi_Basic",
+    "XSS_Hunter",
+    "CSRF_Token",
+    "JWT_Forge",
+    "LFI_Path",
+    "BuffOver",
+    "ROP_Chain",
+    "Format_Str",
+    "HeapSpray",
+    "Stack_Canary",
+    "RE_Basics",
+    "Unpack_Me",
+    "Anti_Debug",
+    "VM_Detect",
+    "Code_Cave",
+    "Zip_Bomb",
+    "QR_Hidden",
+    "Audio_Spec",
+    "Polyglot",
+    "Base64_Nest",
+    "LSB_Hide",
+    "Pixel_Art",
+    "PNG_Secret",
+    "JPEG_Meta",
+    "GIF_Frame",
+    "Google_Fu",
+    "LinkedIn",
+    "Username",
+    "Email_Hunt",
+    "Geo_Photo",
+    "Disk_Image",
+    "Memory_Dump",
+    "Network_Cap",
+    "Log_Analysis",
+    "File_Carv",
+    "Blind_SQL",
+    "XXE_Parse",
+    "SSTI_Jinja",
+    "Deserialization",
+    "Race_Cond",
+    "Use_After_Free",
+    "Double_Free",
+    "Integer_Over",
+    "Path_Traverse",
+    "Command_Inj",
+)
+
+# Realistic solve codes, filled in with each challenge's name
+SOLVE_CODE_TEMPLATES = (
+    "print('Hello {lab_name}!')",
+    "import requests; r = requests.get('/{lab_lower}')",
+    "curl -X POST /api/{lab_lower}",
+    "SELECT * FROM {lab_lower} WHERE id=1",
+    "python exploit_{lab_lower}.py",
+    "nc target.com 1337 < payload_{lab_name}.txt",
+    "./solve_{lab_lower}.sh",
+    "echo 'flag{{solved_{lab_lower}}}' | base64",
+    "openssl enc -d -aes256 < {lab_lower}.enc",
+    "john --wordlist=rockyou.txt {lab_lower}.hash",
+    # Multi-line Python exploit
+    """#!/usr/bin/env python3
 import requests
 import sys
 
 target = sys.argv[1] if len(sys.argv) > 1 else 'localhost'
 payload = {{'injection': 'admin\\'--'}}
 
-r = requests.post(f'http://{{target}}/{lab_name.lower()}', data=payload)
+r = requests.post(f'http://{{target}}/{lab_lower}', data=payload)
 if 'flag{{' in r.text:
     print('Success! Found flag in response')
     print(r.text)
 else:
     print('Exploit failed')""",
-                # Multi-line bash script
-                f"""#!/bin/bash
+    # Multi-line bash script
+    """#!/bin/bash
 echo "Starting {lab_name} exploit..."
 TARGET_HOST=${{1:-localhost}}
 TARGET_PORT=${{2:-8080}}
 
 # Step 1: Enumerate endpoints
 echo "Enumerating endpoints..."
-curl -s http://$TARGET_HOST:$TARGET_PORT/{lab_name.lower()}/
+curl -s http://$TARGET_HOST:$TARGET_PORT/{lab_lower}/
 
 # Step 2: Send payload
 echo "Sending payload..."
 curl -X POST \\
   -H "Content-Type: application/json" \\
   -d '{{"exploit": "payload"}}' \\
-  http://$TARGET_HOST:$TARGET_PORT/{lab_name.lower()}/submit
+  http://$TARGET_HOST:$TARGET_PORT/{lab_lower}/submit
 
 echo "Exploit complete!""",
-                # Multi-line SQL injection
-                f"""-- {lab_name} SQL Injection Exploit
+    # Multi-line SQL injection
+    """-- {lab_name} SQL Injection Exploit
 -- Step 1: Test for basic injection
 ' OR 1=1--
 
@@ -223,9 +189,9 @@ echo "Exploit complete!""",
 ' UNION SELECT id,username,password FROM users WHERE username='admin'--
 
 -- Step 4: Extract flag
-' UNION SELECT flag FROM {lab_name.lower()}_flags LIMIT 1--""",
-                # Multi-line C exploit
-                f"""#include <stdio.h>
+' UNION SELECT flag FROM {lab_lower}_flags LIMIT 1--""",
+    # Multi-line C exploit
+    """#include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
 
@@ -245,8 +211,8 @@ int main(int argc, char *argv[]) {{
     
     return 0;
 }}""",
-                # Multi-line JavaScript payload
-                f"""// {lab_name} XSS Payload
+    # Multi-line JavaScript payload
+    """// {lab_name} XSS Payload
 function exploit() {{
     // Step 1: Test for XSS
     var payload = '<script>alert("XSS")</script>';
@@ -255,7 +221,7 @@ function exploit() {{
     var url = window.location.href + '?search=' + encodeURIComponent(payload);
     
     // Step 3: Send to target
-    fetch('/api/{lab_name.lower()}', {{
+    fetch('/api/{lab_lower}', {{
         method: 'POST',
         headers: {{'Content-Type': 'application/json'}},
         body: JSON.stringify({{
@@ -272,18 +238,129 @@ function exploit() {{
 }}
 
 exploit();""",
-            ]
-            solve_code = random.choice(solve_codes)
+)
+
+
+async def write_frames(writer, payloads):
+    """Write submissions as length-prefixed frames, then close the sending side."""
+    for payload in payloads:
+        writer.write(FRAME_HEADER.pack(len(payload)) + payload)
+        await writer.drain()  # Only waits when the server falls behind
+    writer.write_eof()  # Nothing more to send
+
+
+async def send_framed_payloads(server_host, server_port, payloads):
+    """Send many submissions as length-prefixed frames over one connection."""
+    try:
+        async with asyncio.timeout(SEND_TIMEOUT) as timeout:
+            reader, writer = await asyncio.open_connection(server_host, server_port)
+
+            # Replies are read while frames are still going out; the server
+            # stops reading when its replies back up
+            sending = asyncio.create_task(write_frames(writer, payloads))
+            try:
+                await reader.readline()  # Welcome message (not used)
+
+                # One framed reply per submission, in order
+                accepted = 0
+                for _ in payloads:
+                    (size,) = FRAME_HEADER.unpack(
+                        await reader.readexactly(FRAME_HEADER.size)
+                    )
+                    reply = await reader.readexactly(size)
+                    if not reply.startswith(ERROR_REPLY_PREFIXES):
+                        accepted += 1
+                    # The deadline is for a stalled server, not for a long batch
+                    timeout.reschedule(asyncio.get_running_loop().time() + SEND_TIMEOUT)
+                await sending
+            finally:
+                # Stop the writer if reading ended early, and collect its
+                # failure so it isn't reported as never retrieved
+                sending.cancel()
+                with contextlib.suppress(asyncio.CancelledError, ConnectionError, OSError):
+                    await sending
+
+            writer.close()
+            await writer.wait_closed()
+        return accepted
+
+    except TimeoutError:
+        raise  # A stalled server won't answer the rest either; stop the run
+    except (ConnectionError, OSError, asyncio.IncompleteReadError) as e:
+        print(f"Error sending scores: {e}")
+        return 0
+
+
+async def send_all_payloads(server_host, server_port, payloads):
+    """Send every payload, spread round-robin over FRAMED_CONNECTIONS."""
+    results = await asyncio.gather(
+        *(
+            send_framed_payloads(server_host, server_port, payloads[i::FRAMED_CONNECTIONS])
+            for i in range(min(FRAMED_CONNECTIONS, len(payloads)))
+        )
+    )
+    return sum(results)
 
-            if send_score(
-                server_host, server_port, player_name, lab_name, base_score, solve_code
-            ):
-                total_entries += 1
 
-            time.sleep(0.01)
+def generate_test_data(
+    server_host="localhost",
+    server_port=8080,
+    seed=None,
+):
+    """Generate comprehensive test data for the scoreboard."""
+    # One generator for the whole run; pass a seed to reproduce a data set
+    rng = random.Random(seed)
+    randint, sample, rand, choice = rng.randint, rng.sample, rng.random, rng.choice
+    tie_scores = (10, 25, 50, 100, 150, 200)
+
+    print(f"Generating test data for {len(CHALLENGE_NAMES)} labs...")
+    print("Sample lab names:", list(CHALLENGE_NAMES[:10]))
+
+    payloads = []
+
+    for lab_name in CHALLENGE_NAMES:
+        num_players = randint(3, 15)
+        lab_players = sample(FIRST_NAMES, min(num_players, len(FIRST_NAMES)))
+
+        print(f"Creating {num_players} entries for {lab_name}...")
+
+        # Realistic solve codes for this challenge; shared by all its players
+        lab_lower = lab_name.lower()
+        solve_codes = [
+            template.format(lab_name=lab_name, lab_lower=lab_lower)
+            for template in SOLVE_CODE_TEMPLATES
+        ]
+        # Encode the fixed parts once; each submission is then one bytes format
+        lab_field = f",{lab_name},".encode("ascii")
+        code_fields = [f",{code}".encode("ascii") for code in solve_codes]
+
+        # Draw every player's score and solve code for the lab in one call each
+        base_scores = rng.choices(range(1, 301), k=len(lab_players))
+        lab_code_fields = rng.choices(code_fields, k=len(lab_players))
+
+        for player_name, base_score, code_field in zip(
+            lab_players, base_scores, lab_code_fields
+        ):
+            if rand() < 0.15:  # 15% chance of tie
+                base_score = choice(tie_scores)
+
+            payloads.append(
+                b"%b%b%d%b"
+                % (player_name.encode("ascii"), lab_field, base_score, code_field)
+            )
+
+    print(f"Sending {len(payloads)} scores over {FRAMED_CONNECTIONS} connections...")
+    try:
+        total_entries = asyncio.run(
+            send_all_payloads(server_host, server_port, payloads)
+        )
+    except TimeoutError:
+        print(f"\nNo reply from {server_host}:{server_port} within {SEND_TIMEOUT}s")
+        print("Test data generation aborted")
+        return 0
 
     print("\nTest data generation complete!")
-    print(f"Created {total_entries} total entries across {len(labs)} labs")
+    print(f"Created {total_entries} total entries across {len(CHALLENGE_NAMES)} labs")
     return total_entries
 
 
@@ -291,7 +368,10 @@ def test_single_score(server_host="localhost", server_port=8080):
     """Test sending a single score (original functionality)."""
     try:
         client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Fail fast instead of hanging on a dead or wrong server
+        client_socket.settimeout(SEND_TIMEOUT)
         client_socket.connect((server_host, server_port))
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
         welcome = client_socket.recv(1024)
         print(
@@ -299,11 +379,15 @@ def test_single_score(server_host="localhost", server_port=8080):
         )
 
         test_message = "TestUser,Demo,42,print('Hello World!')\n"
-        client_socket.send(test_message.encode("ascii"))
+        client_socket.sendall(test_message.encode("ascii"))
+        client_socket.shutdown(socket.SHUT_WR)  # Nothing more to send
         print(f"Sent message ({len(test_message)} bytes): {test_message.strip()}")
 
-        # Receive response
-        response = client_socket.recv(4096)
+        # Receive response until the server closes the connection
+        chunks = []
+        while chunk := client_socket.recv(65536):
+            chunks.append(chunk)
+        response = b"".join(chunks)
         print(f"Received response:\n{response.decode('ascii')}")
 
         client_socket.close()